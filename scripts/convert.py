@@ -25,17 +25,50 @@ Auto-detect:
 from __future__ import annotations
 
 import argparse
-import re
+import os
 import sys
+from collections import deque
+from functools import lru_cache
+from itertools import islice
+from multiprocessing import Pool
 from pathlib import Path
-from typing import Iterable
+from typing import Callable, Iterable, Iterator
 
 
-DMS_RE = re.compile(r"^[NSEW]\d{3}\.\d{2}\.\d{2}\.\d{3}$", re.IGNORECASE)
+# Input files are read in binary chunks of this size.
+_READ_CHUNK = 1 << 20
+# Output is streamed through a buffer of this size.
+_WRITE_BUFFER = 1 << 20
+
+# Records have at most 12 fields; splitting one more time than that is enough to
+# spot (and reject) longer lines without splitting them completely.
+_MAX_SPLIT = 12
+
+# Records are read, converted and written in blocks of this many lines, so
+# memory use does not grow with the input.
+_BLOCK_LINES = 4096
+
+# Input files at least this large are converted in a process pool (one block
+# per task) when more than one CPU is available.
+_PARALLEL_MIN_BYTES = 4 << 20
+
+# Zero-padded strings for the DMS components, indexed by value.
+# DMS output has three degree digits, so larger values are rejected up front.
+_MAX_DEGREES = 999
+_D3 = [f"{i:03d}" for i in range(_MAX_DEGREES + 1)]
+_D2 = [f"{i:02d}" for i in range(60)]
 
 
 def looks_like_dms(s: str) -> bool:
-    return bool(DMS_RE.match(s.strip()))
+    # Fixed-width HDDD.MM.SS.sss, e.g. N050.54.03.056
+    s = s.strip()
+    return (
+        len(s) == 14
+        and s[0] in "NSEWnsew"
+        and s[4] == "." and s[7] == "." and s[10] == "."
+        and s[1:4].isdecimal() and s[5:7].isdecimal()
+        and s[8:10].isdecimal() and s[11:14].isdecimal()
+    )
 
 
 def looks_like_decimal(s: str) -> bool:
@@ -46,45 +79,28 @@ def looks_like_decimal(s: str) -> bool:
         return False
 
 
+@lru_cache(maxsize=4096)
 def decimal_to_dms_hem(value: float, is_lat: bool) -> str:
     if is_lat:
         hem = "N" if value >= 0 else "S"
     else:
         hem = "E" if value >= 0 else "W"
 
+    # Seconds are rounded to 3 decimals exactly as before (round(x, 3) rounds the
+    # exact binary value), then everything is carried in whole milliseconds.
     v = abs(value)
     deg = int(v)
     minutes_full = (v - deg) * 60.0
     minute = int(minutes_full)
-    seconds = (minutes_full - minute) * 60.0
-
-    seconds = round(seconds, 3)
-    if seconds >= 60.0:
-        seconds -= 60.0
-        minute += 1
-    if minute >= 60:
-        minute -= 60
-        deg += 1
-
-    deg_str = f"{deg:03d}"
-    min_str = f"{minute:02d}"
-
-    sec_int = int(seconds)
-    sec_frac = int(round((seconds - sec_int) * 1000.0))
-    if sec_frac == 1000:
-        sec_frac = 0
-        sec_int += 1
-        if sec_int >= 60:
-            sec_int = 0
-            minute += 1
-            if minute >= 60:
-                minute = 0
-                deg += 1
-                deg_str = f"{deg:03d}"
-                min_str = f"{minute:02d}"
-
-    sec_str = f"{sec_int:02d}.{sec_frac:03d}"
-    return f"{hem}{deg_str}.{min_str}.{sec_str}"
+    sec_ms = round(round((minutes_full - minute) * 60.0, 3) * 1000.0)
+    carry, rem = divmod(minute * 60_000 + sec_ms, 3_600_000)
+    deg += carry
+    minute, rem = divmod(rem, 60_000)
+    sec_int, sec_frac = divmod(rem, 1000)
+    if deg > _MAX_DEGREES:
+        raise ValueError(f"Degrees out of range (max {_MAX_DEGREES}) in {value!r}")
+
+    return f"{hem}{_D3[deg]}.{_D2[minute]}.{_D2[sec_int]}.{_D3[sec_frac]}"
 
 
 def dms_hem_to_decimal(text: str, is_lat: bool) -> float:
@@ -125,8 +141,9 @@ def dms_hem_to_decimal(text: str, is_lat: bool) -> float:
     return dec
 
 
-def format_decimal(value: float, places: int) -> str:
-    return f"{value:.{places}f}"
+def decimal_formatter(places: int) -> Callable[[float], str]:
+    # Parse the format spec once, not for every value
+    return f"{{:.{places}f}}".format
 
 
 def detect_mode(parts: list[str]) -> bool | None:
@@ -136,14 +153,31 @@ def detect_mode(parts: list[str]) -> bool | None:
       False -> should be forward (decimal -> DMS)
       None  -> cannot tell
     """
-    coord_fields = parts[2:10]
-    dms_hits = sum(1 for s in coord_fields if looks_like_dms(s))
-    dec_hits = sum(1 for s in coord_fields if looks_like_decimal(s))
-
-    if dms_hits == 8 and dec_hits == 0:
-        return True
-    if dec_hits == 8 and dms_hits == 0:
-        return False
+    # The first field is almost always representative, so test its kind first on
+    # every field. A field is never both kinds, so the order does not change the
+    # counts, and a majority of 5 settles the result early.
+    if looks_like_decimal(parts[2]):
+        likely, other, likely_dms = looks_like_decimal, looks_like_dms, False
+    else:
+        likely, other, likely_dms = looks_like_dms, looks_like_decimal, True
+
+    likely_hits = 0
+    other_hits = 0
+    for idx in range(2, 10):
+        s = parts[idx]
+        if likely(s):
+            likely_hits += 1
+            if likely_hits >= 5:
+                return likely_dms
+        elif other(s):
+            other_hits += 1
+            if other_hits >= 5:
+                return not likely_dms
+
+    if likely_dms:
+        dms_hits, dec_hits = likely_hits, other_hits
+    else:
+        dms_hits, dec_hits = other_hits, likely_hits
 
     # Mixed/ambiguous
     if dms_hits > dec_hits and dms_hits >= 4:
@@ -158,34 +192,102 @@ def convert_record_line(line: str, reverse: bool, decimal_places: int) -> str:
     if not stripped:
         return line.rstrip("\n")
 
-    parts = stripped.split(":")
+    parts = stripped.split(":", _MAX_SPLIT)
     if len(parts) not in (11, 12):
         raise ValueError(
-            f"Unexpected field count {len(parts)} (expected 11 or 12) in line: {line!r}"
+            f"Unexpected field count {stripped.count(':') + 1} (expected 11 or 12) in line: {line!r}"
         )
 
+    return convert_record_line_parsed(parts, record_converter(reverse, decimal_places))
+
+
+@lru_cache(maxsize=None)
+def record_converter(reverse: bool, decimal_places: int) -> Callable[[str, bool], str]:
+    """
+    Field converter (text, is_lat) -> text for one direction. Built once per
+    (reverse, decimal_places) and reused for every record.
+    """
+    if reverse:
+        fmt = decimal_formatter(decimal_places)
+
+        def conv(s: str, is_lat: bool) -> str:
+            return fmt(dms_hem_to_decimal(s, is_lat))
+    else:
+        def conv(s: str, is_lat: bool) -> str:
+            return decimal_to_dms_hem(float(s), is_lat)
+    return conv
+
+
+def convert_record_line_parsed(parts: list[str], conv: Callable[[str, bool], str]) -> str:
+    """
+    Like convert_record_line, for a record that has already been split on ':'.
+    conv converts one coordinate field (see record_converter).
+    """
     out = parts[:]
-    # Convert ONLY indices 2..9 (8 coordinate fields)
-    for j, idx in enumerate(range(2, 10)):
-        is_lat = (j % 2 == 0)
-        raw = parts[idx].strip()
-        if reverse:
-            dec = dms_hem_to_decimal(raw, is_lat=is_lat)
-            out[idx] = format_decimal(dec, places=decimal_places)
-        else:
-            dec = float(raw)
-            out[idx] = decimal_to_dms_hem(dec, is_lat=is_lat)
+    # Convert ONLY indices 2..9 (8 coordinate fields, 4 lat/lon pairs)
+    out[2] = conv(parts[2], True)
+    out[3] = conv(parts[3], False)
+    out[4] = conv(parts[4], True)
+    out[5] = conv(parts[5], False)
+    out[6] = conv(parts[6], True)
+    out[7] = conv(parts[7], False)
+    out[8] = conv(parts[8], True)
+    out[9] = conv(parts[9], False)
 
     return ":".join(out)
 
 
+def force_hint(parts: list[str], reverse: bool) -> str:
+    """Hint for a record that failed to convert in the direction forced by --force."""
+    coord_fields = parts[2:10]
+    if any(looks_like_dms(s) for s in coord_fields) and not reverse:
+        return " (Hint: these look like DMS; try --reverse or remove --force)"
+    if any(looks_like_decimal(s) for s in coord_fields) and reverse:
+        return " (Hint: these look like decimals; remove --reverse or remove --force)"
+    return ""
+
+
+def convert_blocks_parallel(
+    blocks: Iterable[list[str]], reverse: bool, force: bool, decimal_places: int
+) -> Iterator[tuple[str, list[str], ValueError | None]]:
+    """
+    Like convert_block for every block, spread over all CPUs. Results are
+    yielded in input order, with at most two blocks per CPU in flight.
+    """
+    workers = os.cpu_count() or 1
+    with Pool(workers) as pool:
+        pending = deque()
+        for block in blocks:
+            pending.append(pool.apply_async(convert_block, (block, reverse, force, decimal_places)))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+
+
 def iter_input_lines(direct: str | None, infile: Path | None) -> Iterable[str]:
     if direct is not None:
         yield direct
         return
     if infile is not None:
-        with infile.open("r", encoding="utf-8") as f:
-            yield from f
+        with infile.open("rb") as f:
+            tail = b""
+            while True:
+                chunk = f.read(_READ_CHUNK)
+                if not chunk:
+                    break
+                data = tail + chunk
+                # Carry the last, possibly partial, line over to the next chunk.
+                # A trailing '\r' may have its '\n' in the next chunk, so it does
+                # not count as a complete line break yet.
+                end = len(data) - 1 if data.endswith(b"\r") else len(data)
+                cut = max(data.rfind(b"\n", 0, end), data.rfind(b"\r", 0, end)) + 1
+                tail = data[cut:]
+                # bytes.splitlines() only breaks on '\r' and '\n', like text mode
+                for line in data[:cut].splitlines():
+                    yield line.decode("utf-8")
+        for line in tail.splitlines():
+            yield line.decode("utf-8")
         return
     yield from sys.stdin
 
@@ -194,6 +296,57 @@ def warn(msg: str) -> None:
     sys.stderr.write(f"WARNING: {msg}\n")
 
 
+def convert_block(
+    lines: list[str], reverse: bool, force: bool, decimal_places: int
+) -> tuple[str, list[str], ValueError | None]:
+    """
+    Convert a block of input lines in order.
+
+    Returns the output text, the auto-detection warnings, and the error of the
+    first line that failed (None if all lines converted). Lines after a failed
+    line are not looked at, so the warnings are exactly those emitted up to it.
+    """
+    out: list[str] = []
+    notes: list[str] = []
+    for raw in lines:
+        # Pass through comments + blank lines unchanged.
+        # One strip() serves both this test and the record parsing below.
+        stripped = raw.strip()
+        if not stripped or stripped[0] == "#":
+            out.append(raw.rstrip("\n"))
+            continue
+
+        parts = stripped.split(":", _MAX_SPLIT)
+        if len(parts) not in (11, 12):
+            error = ValueError(
+                f"Unexpected field count {stripped.count(':') + 1} (expected 11 or 12) in line: {raw!r}"
+            )
+            return "", notes, error
+
+        chosen_reverse = reverse
+        if not force:
+            detected = detect_mode(parts)
+            if detected is not None and detected != reverse:
+                # User "should have used" the other direction
+                if detected:
+                    notes.append(f"Input looks like DMS but --reverse was not set; auto-enabling --reverse for: {stripped!r}")
+                else:
+                    notes.append(f"Input looks like decimal but --reverse was set; auto-disabling --reverse for: {stripped!r}")
+                chosen_reverse = detected
+
+        try:
+            out.append(convert_record_line_parsed(parts, record_converter(chosen_reverse, decimal_places)))
+        except ValueError as e:
+            # If force mode caused failure, add a helpful hint.
+            hint = force_hint(parts, reverse) if force else ""
+            error = ValueError(f"{e}{hint}")
+            error.__cause__ = e
+            return "", notes, error
+
+    out.append("")
+    return "\n".join(out), notes, None
+
+
 def main() -> int:
     ap = argparse.ArgumentParser(
         description="Convert runway record coordinate fields between decimal degrees and hemisphere DMS."
@@ -217,54 +370,47 @@ def main() -> int:
 
     if args.record is not None and args.file is not None:
         ap.error("Provide either a direct record argument OR --file, not both.")
+    if args.decimal_places < 0:
+        ap.error("--decimal-places must be 0 or greater.")
+
+    lines = iter_input_lines(args.record, args.file)
+    blocks = iter(lambda: list(islice(lines, _BLOCK_LINES)), [])
+    if (
+        args.file is not None
+        and (os.cpu_count() or 1) > 1
+        and args.file.stat().st_size >= _PARALLEL_MIN_BYTES
+    ):
+        results = convert_blocks_parallel(blocks, args.reverse, args.force, args.decimal_places)
+    else:
+        results = (convert_block(block, args.reverse, args.force, args.decimal_places) for block in blocks)
 
-    out_lines: list[str] = []
-
-    for raw in iter_input_lines(args.record, args.file):
-        # Pass through comments + blank lines unchanged
-        if raw.lstrip().startswith("#") or raw.strip() == "":
-            out_lines.append(raw.rstrip("\n"))
-            continue
-
-        stripped = raw.strip()
-        parts = stripped.split(":")
-        if len(parts) not in (11, 12):
-            raise ValueError(
-                f"Unexpected field count {len(parts)} (expected 11 or 12) in line: {raw!r}"
-            )
-
-        chosen_reverse = args.reverse
-        if not args.force:
-            detected = detect_mode(parts)
-            if detected is not None and detected != args.reverse:
-                # User "should have used" the other direction
-                if detected:
-                    warn(f"Input looks like DMS but --reverse was not set; auto-enabling --reverse for: {stripped!r}")
-                else:
-                    warn(f"Input looks like decimal but --reverse was set; auto-disabling --reverse for: {stripped!r}")
-                chosen_reverse = detected
-
-        try:
-            converted = convert_record_line(raw, reverse=chosen_reverse, decimal_places=args.decimal_places)
-        except ValueError as e:
-            # If force mode caused failure, add a helpful hint.
-            hint = ""
-            if args.force:
-                coord_fields = parts[2:10]
-                if any(looks_like_dms(s) for s in coord_fields) and not args.reverse:
-                    hint = " (Hint: these look like DMS; try --reverse or remove --force)"
-                elif any(looks_like_decimal(s) for s in coord_fields) and args.reverse:
-                    hint = " (Hint: these look like decimals; remove --reverse or remove --force)"
-            raise ValueError(f"{e}{hint}") from e
-
-        out_lines.append(converted)
+    if args.output:
+        # Write next to the target and move it into place once everything has
+        # converted, so a bad line does not leave a partial output file.
+        tmp_path = args.output.with_name(f".{args.output.name}.tmp")
+        out = tmp_path.open("wb", buffering=_WRITE_BUFFER)
+    else:
+        out = sys.stdout.buffer
 
-    output_text = "\n".join(out_lines) + ("\n" if out_lines else "")
+    try:
+        for text, notes, error in results:
+            for note in notes:
+                warn(note)
+            if error is not None:
+                raise error
+            out.write(text.encode("utf-8"))
+    except BaseException:
+        results.close()
+        if args.output:
+            out.close()
+            tmp_path.unlink()
+        raise
 
     if args.output:
-        args.output.write_text(output_text, encoding="utf-8")
+        out.close()
+        os.replace(tmp_path, args.output)
     else:
-        sys.stdout.write(output_text)
+        out.flush()
 
     return 0
 
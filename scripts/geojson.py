@@ -15,15 +15,25 @@ from __future__ import annotations
 
 import argparse
 import json
+import math
+import sys
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+try:
+    import orjson  # optional, faster serialization for --compact output
+except ImportError:
+    orjson = None
 
+
+@lru_cache(maxsize=8192)
 def _to_float(s: str) -> float:
-    return float(s.strip())
+    # float() already ignores surrounding whitespace
+    return float(s)
 
 
-def parse_line(line: str) -> Optional[Dict[str, Any]]:
+def parse_line(line: str, debug_raw: bool = False) -> Optional[Dict[str, Any]]:
     line = line.strip()
     if not line or line.startswith("#"):
         return None
@@ -32,8 +42,9 @@ def parse_line(line: str) -> Optional[Dict[str, Any]]:
     if len(parts) < 3:
         return None  # not a valid data line
 
-    airport = parts[0].strip()
-    runway = parts[1].strip()
+    # Interned so every feature of the same airport/runway shares one string
+    airport = sys.intern(parts[0].strip())
+    runway = sys.intern(parts[1].strip())
 
     # Everything after airport/runway: some number of lat/lon pairs, then taxitime, then optional remarks
     rest = parts[2:]
@@ -55,11 +66,10 @@ def parse_line(line: str) -> Optional[Dict[str, Any]]:
     if len(coord_tokens) < 4 or (len(coord_tokens) % 2 != 0):
         raise ValueError(f"Bad coordinate token count on line: {line!r}")
 
-    coords: List[Tuple[float, float]] = []
-    for i in range(0, len(coord_tokens), 2):
-        lat = _to_float(coord_tokens[i])
-        lon = _to_float(coord_tokens[i + 1])
-        coords.append((lon, lat))  # GeoJSON is [lon, lat]
+    flat = list(map(_to_float, coord_tokens))
+    if not all(map(math.isfinite, flat)):
+        raise ValueError(f"Non-finite coordinate on line: {line!r}")
+    coords: List[Tuple[float, float]] = list(zip(flat[1::2], flat[0::2]))  # GeoJSON is [lon, lat]
 
     # Determine geometry
     if len(coords) == 4:
@@ -86,24 +96,30 @@ def parse_line(line: str) -> Optional[Dict[str, Any]]:
             props["taxitime"] = float(taxitime_str)
         except ValueError:
             props["taxitime"] = taxitime_str
+        else:
+            # NaN/Infinity are not valid JSON; keep them as text
+            if not math.isfinite(props["taxitime"]):
+                props["taxitime"] = taxitime_str
 
     if remarks is not None:
         props["remarks"] = remarks
 
-    return {
+    feature: Dict[str, Any] = {
         "type": "Feature",
         "geometry": geometry,
         "properties": props,
-        "raw": line,  # handy for debugging; remove if you don't want it
     }
+    if debug_raw:
+        feature["raw"] = line  # handy for debugging
+    return feature
 
 
-def convert_file(input_path: Path) -> Dict[str, Any]:
+def convert_file(input_path: Path, debug_raw: bool = False) -> Dict[str, Any]:
     features: List[Dict[str, Any]] = []
 
-    for lineno, line in enumerate(input_path.read_text(encoding="utf-8").splitlines(), start=1):
+    for lineno, line in enumerate(input_path.read_bytes().decode("utf-8").splitlines(), start=1):
         try:
-            feat = parse_line(line)
+            feat = parse_line(line, debug_raw=debug_raw)
         except Exception as e:
             raise ValueError(f"Error on line {lineno}: {e}") from e
         if feat:
@@ -112,16 +128,32 @@ def convert_file(input_path: Path) -> Dict[str, Any]:
     return {"type": "FeatureCollection", "features": features}
 
 
+def dump_geojson(geojson: Dict[str, Any], compact: bool = False) -> bytes:
+    # The default (indented) output always comes from the stdlib, so checked-in
+    # files do not depend on whether orjson is installed.
+    if not compact:
+        return json.dumps(geojson, indent=2).encode("utf-8")
+    if orjson is not None:
+        try:
+            return orjson.dumps(geojson)
+        except TypeError:  # orjson.JSONEncodeError, e.g. integers beyond 64 bits
+            pass
+    # Without indent the stdlib uses its C encoder
+    return json.dumps(geojson, separators=(",", ":")).encode("utf-8")
+
+
 def main() -> None:
     ap = argparse.ArgumentParser(description="Convert apron/taxi lines to GeoJSON.")
     ap.add_argument("input", type=Path, help="Input text file")
     ap.add_argument("-o", "--output", type=Path, default=None, help="Output GeoJSON file (default: <input>.geojson)")
+    ap.add_argument("--debug-raw", action="store_true", help="Include the source line as a 'raw' member of each feature")
+    ap.add_argument("--compact", action="store_true", help="Write GeoJSON without indentation (uses orjson if installed)")
     args = ap.parse_args()
 
     out_path = args.output or args.input.with_suffix(".geojson")
-    geojson = convert_file(args.input)
+    geojson = convert_file(args.input, debug_raw=args.debug_raw)
 
-    out_path.write_text(json.dumps(geojson, indent=2), encoding="utf-8")
+    out_path.write_bytes(dump_geojson(geojson, compact=args.compact))
     print(f"Wrote {out_path} ({len(geojson['features'])} features)")
 
 